@@ -4,11 +4,19 @@ Markdown to Office Converter
 Converts Markdown files to PDF, DOCX, XLSX, and PPTX formats
 """
 import argparse
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import html
+import importlib.util
 import io
+import mmap
 import os
+import pathlib
 import re
 import sys
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import markdown2
 
@@ -16,16 +24,35 @@ import markdown2
 try:
     from xhtml2pdf import pisa
     from pypdf import PdfReader, PdfWriter
-    import pdfplumber
+    # ReportLab ships with xhtml2pdf; used directly for plain-text sections
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
     PDF_AVAILABLE = True
 except ImportError:
     PDF_AVAILABLE = False
 
+# Optional faster HTML backend. Only looked up here: it also needs the pango system
+# libraries, and importing it without them prints a banner, so it loads on first use
+WEASYPRINT_AVAILABLE = importlib.util.find_spec('weasyprint') is not None
+
+# Optional faster markdown parser; the instance is built once and reused
+try:
+    import mistune
+    # escape=False passes raw HTML through, as markdown2 does
+    _mistune_markdown = mistune.create_markdown(escape=False, plugins=['table'])
+    MISTUNE_AVAILABLE = True
+except ImportError:
+    MISTUNE_AVAILABLE = False
+
 # Office format support
 try:
     from docx import Document
     from docx.shared import Inches, Pt, RGBColor
     from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
     DOCX_AVAILABLE = True
 except ImportError:
     DOCX_AVAILABLE = False
@@ -33,6 +60,7 @@ except ImportError:
 try:
     from openpyxl import Workbook, load_workbook
     from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.utils import get_column_letter
     XLSX_AVAILABLE = True
 except ImportError:
     XLSX_AVAILABLE = False
@@ -45,139 +73,528 @@ try:
 except ImportError:
     PPTX_AVAILABLE = False
 
+# Precompiled patterns for markdown parsing and title matching
+_BOLD_RE = re.compile(r'(\*\*.*?\*\*)')
+_HEADING_RE = re.compile(r'^(#{1,3}) (.*)')
+_WS_RE = re.compile(r'\s+')
+_HDR_RE = re.compile(r'^[ \t]*##[ \t]+(\S.*?)\s*$')
+# Characters and line shapes that markdown2 could turn into markup (inline syntax,
+# raw HTML/entities; list/code/rule/setext lines, trailing-space line breaks)
+_MD_INLINE_CHARS = r'\\`*_\[\]|<>&'
+_MD_LINE_SHAPES = r'^[ \t]*(?:[-+]|\d+\.)[ \t]|^(?: {4}|\t)|^[ \t]*[=-]+[ \t]*$| {2,}\r?$'
+_MD_SIG = re.compile('[' + _MD_INLINE_CHARS + '#]|' + _MD_LINE_SHAPES, re.M)
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+# _MD_SIG without '#', so content whose only markup is ATX headings does not match
+_RICH_MD_SIG = re.compile('[' + _MD_INLINE_CHARS + ']|' + _MD_LINE_SHAPES, re.M)
+_ATX_RE = re.compile(r'^(#{1,6})[ \t]+(.*?)[ \t#]*$')
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+# While main() runs, status messages are collected here and written out in one go
+_log_buffer: Optional[io.StringIO] = None
+
+
+def _log(msg: str = '') -> None:
+    """Print a status message, or queue it while main() is buffering output."""
+    if _log_buffer is None:
+        print(msg)
+    else:
+        _log_buffer.write(msg + '\n')
+
+
+# Buffer size for PDF output files, so pisa/pypdf's many small writes are coalesced
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _atomic_save(save_callable, path: str) -> None:
+    """Save to a temporary file next to path with save_callable, then rename it into place."""
+    tmp_path = path + '.tmp'
+    try:
+        save_callable(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _atomic_write(write_callable, path: str) -> None:
+    """Like _atomic_save, but hands write_callable a buffered binary file object."""
+    def save(tmp_path: str) -> None:
+        with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            write_callable(f)
+    
+    _atomic_save(save, path)
+
+
+# Markdown files larger than this are decoded straight from a memory map
+_MMAP_THRESHOLD = 256 * 1024
+
+
+def _read_markdown(path: str) -> str:
+    """Read a UTF-8 markdown file with universal newlines, as open() in text mode would."""
+    if os.path.getsize(path) <= _MMAP_THRESHOLD:
+        return pathlib.Path(path).read_text(encoding='utf-8')
+    
+    # Decode from the mapping directly, skipping the intermediate bytes copy of f.read()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = str(mm, 'utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
 
 # ============================================================================
 # PDF Functions (existing)
 # ============================================================================
 
-def get_html_template(content: str) -> str:
-    """Generate HTML template with styling for PDF conversion."""
-    return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        @page {{
+# Stylesheet shared by both HTML backends
+_PDF_CSS = """
+        @page {
             size: letter landscape;
             margin: 0.5in;
-        }}
-        body {{
+        }
+        body {
             font-family: Arial, sans-serif;
-        }}
-        table {{
+        }
+        table {
             border-collapse: collapse;
             width: 100%;
             font-size: 8px;
-        }}
-        th, td {{
+        }
+        th, td {
             border: 1px solid #333;
             padding: 6px;
             text-align: left;
-        }}
-        th {{
+        }
+        th {
             background-color: #4CAF50;
             color: white;
             font-weight: bold;
-        }}
-        tr:nth-child(even) {{
+        }
+        tr:nth-child(even) {
             background-color: #f2f2f2;
-        }}
-    </style>
+        }
+"""
+
+
+# Fixed document around the rendered body, built once at import time
+_HTML_PREFIX = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>""" + _PDF_CSS + """    </style>
 </head>
 <body>
-    {content}
+    """
+_HTML_SUFFIX = """
 </body>
 </html>
 """
+# Pre-encoded copies so pisa gets bytes without re-encoding the boilerplate each render
+_HTML_PREFIX_BYTES = _HTML_PREFIX.encode('utf-8')
+_HTML_SUFFIX_BYTES = _HTML_SUFFIX.encode('utf-8')
 
 
-def markdown_to_pdf_bytes(md_content: str) -> bytes:
-    """Convert markdown content to PDF bytes."""
-    html_content = markdown2.markdown(md_content, extras=['tables'])
-    full_html = get_html_template(html_content)
+def get_html_template(content: str) -> str:
+    """Generate HTML template with styling for PDF conversion."""
+    return _HTML_PREFIX + content + _HTML_SUFFIX
+
+
+# Markdown-to-HTML parser (set from --md-backend): 'markdown2' or 'mistune'
+_md_backend = 'markdown2'
+
+
+@functools.lru_cache(maxsize=64)
+def _md_to_html(md_content: str, backend: str = 'markdown2') -> str:
+    """Render markdown to HTML, memoized so identical content is parsed once."""
+    if _MD_SIG.search(md_content) is None:
+        # Plain prose: wrap the paragraphs directly instead of running the markdown parser
+        paragraphs = (para.strip() for para in _PARA_SPLIT_RE.split(md_content))
+        return ''.join(f'<p>{html.escape(para)}</p>\n' for para in paragraphs if para)
+    if backend == 'mistune':
+        return _mistune_markdown(md_content)
+    return markdown2.markdown(md_content, extras=['tables'])
+
+
+def _plain_flowables(md_content: str) -> Optional[list]:
+    """Turn headings-and-paragraphs markdown into ReportLab flowables.
+    
+    Returns None for a '#' line that is not a well-formed ATX heading, since
+    markdown2 may still treat it as one.
+    """
+    styles = getSampleStyleSheet()
+    flowables = []
+    para_lines = []
+    
+    def flush():
+        if para_lines:
+            flowables.append(Paragraph(html.escape(' '.join(para_lines)), styles['Normal']))
+            flowables.append(Spacer(1, 6))
+            para_lines.clear()
+    
+    for line in io.StringIO(md_content):
+        stripped = line.strip()
+        heading = _ATX_RE.match(stripped)
+        if heading:
+            flush()
+            level = len(heading.group(1))
+            flowables.append(Paragraph(html.escape(heading.group(2)), styles[f'Heading{level}']))
+        elif stripped.startswith('#'):
+            return None
+        elif stripped:
+            para_lines.append(stripped)
+        else:
+            flush()
+    flush()
+    
+    return flowables
+
+
+def _render_plain_pdf(md_content: str, dest_fp) -> bool:
+    """Render plain markdown with ReportLab, skipping the HTML/CSS layout in pisa.
     
-    pdf_buffer = io.BytesIO()
-    pisa_status = pisa.CreatePDF(full_html, dest=pdf_buffer)
+    Only used with the pisa backend. The output uses ReportLab's sample
+    stylesheet rather than _PDF_CSS.
+    
+    Returns:
+        False if the content is not plain (or is empty) and needs the pisa path
+    """
+    if _RICH_MD_SIG.search(md_content) is not None:
+        return False
+    flowables = _plain_flowables(md_content)
+    if not flowables:
+        return False
+    
+    margin = 0.5 * inch
+    doc = SimpleDocTemplate(dest_fp, pagesize=landscape(letter),
+                            leftMargin=margin, rightMargin=margin,
+                            topMargin=margin, bottomMargin=margin)
+    doc.build(flowables)
+    return True
+
+
+# HTML-to-PDF backend: 'weasyprint' or 'pisa'. The CLI picks WeasyPrint when it
+# loads (or as --backend says); library callers get pisa unless they set it
+_pdf_backend = 'pisa'
+
+
+@functools.lru_cache(maxsize=None)
+def _load_weasyprint():
+    """Import WeasyPrint on first use, or return None if it or its system libraries are missing.
+    
+    The import runs with stdout/stderr captured, since WeasyPrint prints a
+    multi-line banner when pango cannot be loaded.
+    """
+    if not WEASYPRINT_AVAILABLE:
+        return None
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            import weasyprint
+    except (ImportError, OSError):
+        return None
+    return weasyprint
+
+
+@functools.lru_cache(maxsize=None)
+def _weasy_stylesheet():
+    """Parse _PDF_CSS once for every WeasyPrint render."""
+    return _load_weasyprint().CSS(string=_PDF_CSS)
+
+
+def markdown_to_pdf_stream(md_content: str, dest_fp) -> None:
+    """Convert markdown content to PDF, writing straight into a binary file object."""
+    if _pdf_backend == 'weasyprint':
+        html_content = _md_to_html(md_content, _md_backend)
+        weasyprint = _load_weasyprint()
+        if weasyprint is None:
+            raise RuntimeError("WeasyPrint backend not available")
+        # Resolve relative links and images against the working directory, as pisa does
+        weasyprint.HTML(string=html_content, base_url=os.getcwd()).write_pdf(
+            dest_fp, stylesheets=[_weasy_stylesheet()])
+        return
+    
+    # pisa's HTML/CSS layout is the slow part, so plain content bypasses it
+    if _render_plain_pdf(md_content, dest_fp):
+        return
+    
+    html_content = _md_to_html(md_content, _md_backend)
+    html_bytes = b''.join((_HTML_PREFIX_BYTES, html_content.encode('utf-8'), _HTML_SUFFIX_BYTES))
+    
+    pisa_status = pisa.CreatePDF(io.BytesIO(html_bytes), dest=dest_fp, encoding='utf-8')
     
     if pisa_status.err:
         raise RuntimeError("Error creating PDF from markdown")
+
+
+# Directory for cached PDF renders; None (the default for library callers) disables it.
+# The CLI turns it on from --cache-dir unless --no-cache is given.
+_pdf_cache_dir: Optional[str] = None
+
+# Bump whenever rendering code changes output (plain ReportLab path, markdown extras, ...)
+_CACHE_VERSION = 1
+
+# Once the cache grows past this, the least recently used renders are pruned
+PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Distributions whose version is part of the cache key, per backend
+_RENDERER_DISTRIBUTIONS = {
+    'pisa': ('xhtml2pdf', 'reportlab'),
+    'weasyprint': ('weasyprint',),
+    'markdown2': ('markdown2',),
+    'mistune': ('mistune',),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _renderer_versions(backend: str, md_backend: str) -> str:
+    """Installed versions of the libraries a render depends on, for the cache key."""
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:  # Python 3.7
+        return ''
+    
+    versions = []
+    for name in _RENDERER_DISTRIBUTIONS[backend] + _RENDERER_DISTRIBUTIONS[md_backend]:
+        try:
+            versions.append(f'{name}=={version(name)}')
+        except PackageNotFoundError:
+            versions.append(f'{name}==?')
+    return ','.join(versions)
+
+
+def _pdf_cache_path(md_content: str) -> str:
+    """Cache file for md_content.
     
-    return pdf_buffer.getvalue()
+    The key covers the cache version, the backends and their library versions,
+    and the HTML template, so a change to any of them misses.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{_CACHE_VERSION}/{_pdf_backend}/{_md_backend}/'.encode('ascii'))
+    digest.update(_renderer_versions(_pdf_backend, _md_backend).encode('utf-8'))
+    digest.update(_HTML_PREFIX_BYTES)
+    digest.update(_HTML_SUFFIX_BYTES)
+    digest.update(md_content.encode('utf-8'))
+    return os.path.join(_pdf_cache_dir, digest.hexdigest() + '.pdf')
+
+
+def _pdf_cache_get(md_content: str) -> Optional[bytes]:
+    """Return the cached PDF for md_content, or None on a miss."""
+    if _pdf_cache_dir is None:
+        return None
+    path = _pdf_cache_path(md_content)
+    try:
+        with open(path, 'rb') as f:
+            pdf_bytes = f.read()
+        # Mark the entry as recently used for pruning
+        os.utime(path)
+    except OSError:
+        return None
+    return pdf_bytes
+
+
+def _pdf_cache_put(md_content: str, pdf_bytes: bytes) -> None:
+    """Store a rendered PDF; a cache that cannot be written is simply skipped."""
+    if _pdf_cache_dir is None:
+        return
+    path = _pdf_cache_path(md_content)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_pdf_cache_dir, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _pdf_cache_prune() -> None:
+    """Delete the least recently used renders until the cache fits in PDF_CACHE_MAX_BYTES."""
+    if _pdf_cache_dir is None:
+        return
+    stats = []
+    try:
+        for entry in os.scandir(_pdf_cache_dir):
+            if entry.name.endswith('.pdf') and entry.is_file():
+                st = entry.stat()
+                stats.append((st.st_mtime, st.st_size, entry.path))
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+
+def markdown_to_pdf_buffer(md_content: str) -> io.BytesIO:
+    """Convert markdown content to PDF in a new buffer, rewound and ready for PdfReader.
+    
+    The buffer is handed over without a getvalue() copy. Each call gets its own
+    buffer because PdfReader keeps reading from it lazily.
+    """
+    pdf_bytes = _pdf_cache_get(md_content)
+    if pdf_bytes is not None:
+        return io.BytesIO(pdf_bytes)
+    
+    buffer = io.BytesIO()
+    markdown_to_pdf_stream(md_content, buffer)
+    with buffer.getbuffer() as view:
+        _pdf_cache_put(md_content, view)
+    buffer.seek(0)
+    return buffer
+
+
+def markdown_to_pdf_bytes(md_content: str) -> bytes:
+    """Convert markdown content to PDF bytes, going through the render cache."""
+    return markdown_to_pdf_buffer(md_content).getvalue()
 
 
 # ============================================================================
-# DOCX Functions
+# Markdown Tokenizer
 # ============================================================================
 
-def markdown_to_docx(md_content: str, output_file: str) -> None:
-    """Convert markdown to Word document."""
-    doc = Document()
+class _Peek:
+    """Iterator wrapper that can look one item ahead without consuming it."""
     
-    # Parse markdown
-    lines = md_content.split('\n')
-    i = 0
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self._ahead = []
     
-    while i < len(lines):
-        line = lines[i].strip()
-        
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._ahead:
+            return self._ahead.pop()
+        return next(self._it)
+    
+    def peek(self, default=None):
+        """Return the next item without consuming it, or default when exhausted."""
+        if not self._ahead:
+            try:
+                self._ahead.append(next(self._it))
+            except StopIteration:
+                return default
+        return self._ahead[0]
+
+
+def _parse_md_row(tline: str) -> List[str]:
+    """Split a markdown table row into stripped cell values."""
+    t = tline.strip()
+    if t.startswith('|'):
+        t = t[1:]
+    if t.endswith('|'):
+        t = t[:-1]
+    return [cell.strip() for cell in t.split('|')]
+
+
+def _iter_md_tokens(md_content: str) -> Iterator[Tuple]:
+    """Walk markdown lines once, yielding heading, table and paragraph tokens.
+    
+    Yields:
+        ('h', level, text) for # to ### headers,
+        ('table', rows) for each pipe table (separator row dropped),
+        ('p', line) for any other non-empty line
+    """
+    lines = _Peek(io.StringIO(md_content))
+    
+    for line in lines:
+        line = line.strip()
         if not line:
-            i += 1
             continue
         
-        # Headers
-        if line.startswith('# '):
-            heading = doc.add_heading(line[2:], level=1)
-        elif line.startswith('## '):
-            heading = doc.add_heading(line[3:], level=2)
-        elif line.startswith('### '):
-            heading = doc.add_heading(line[4:], level=3)
+        heading = _HEADING_RE.match(line)
+        if heading:
+            yield ('h', len(heading.group(1)), heading.group(2))
         
-        # Tables
         elif line.startswith('|'):
             table_lines = [line]
-            i += 1
-            while i < len(lines) and lines[i].strip().startswith('|'):
-                table_lines.append(lines[i].strip())
-                i += 1
-            i -= 1
+            while lines.peek('').lstrip().startswith('|'):
+                table_lines.append(next(lines).strip())
             
-            # Parse table
             rows = []
             for tline in table_lines:
                 if '---' in tline:  # Skip separator line
                     continue
-                cells = [cell.strip() for cell in tline.split('|')[1:-1]]
-                rows.append(cells)
+                rows.append(_parse_md_row(tline))
             
             if rows:
-                table = doc.add_table(rows=len(rows), cols=len(rows[0]))
-                table.style = 'Light Grid Accent 1'
-                
-                for row_idx, row_data in enumerate(rows):
-                    for col_idx, cell_data in enumerate(row_data):
-                        table.rows[row_idx].cells[col_idx].text = cell_data
-                        if row_idx == 0:  # Header row
-                            cell = table.rows[row_idx].cells[col_idx]
-                            cell.paragraphs[0].runs[0].bold = True
+                yield ('table', rows)
+        
+        else:
+            yield ('p', line)
+
+
+# ============================================================================
+# DOCX Functions
+# ============================================================================
+
+def _set_cell_text(cell, text: str, bold: bool = False) -> None:
+    """Write text into a new, empty table cell as a single run.
+    
+    New cells already hold one empty paragraph, so a <w:r><w:t> is appended to it
+    directly; cell.text would delete that paragraph and build a fresh one.
+    """
+    run = OxmlElement('w:r')
+    if bold:
+        run_props = OxmlElement('w:rPr')
+        run_props.append(OxmlElement('w:b'))
+        run.append(run_props)
+    text_elem = OxmlElement('w:t')
+    text_elem.text = text
+    run.append(text_elem)
+    cell._tc.find(qn('w:p')).append(run)
+
+
+def markdown_to_docx(md_content: str, output_file: str) -> None:
+    """Convert markdown to Word document."""
+    doc = Document()
+    
+    for token in _iter_md_tokens(md_content):
+        # Headers
+        if token[0] == 'h':
+            _, level, text = token
+            doc.add_heading(text, level=level)
+        
+        # Tables
+        elif token[0] == 'table':
+            rows = token[1]
+            ncols = len(rows[0])
+            table = doc.add_table(rows=len(rows), cols=ncols)
+            table.style = 'Light Grid Accent 1'
+            
+            # Resolve the cell grid once; table.rows/.cells re-walk the XML on every access
+            all_cells = table._cells
+            for row_idx, row_data in enumerate(rows):
+                base = row_idx * ncols
+                for col_idx, cell_data in enumerate(row_data[:ncols]):
+                    is_header = row_idx == 0
+                    _set_cell_text(all_cells[base + col_idx], cell_data, bold=is_header)
         
         # Regular paragraphs
         else:
             # Simple bold/italic support
             para = doc.add_paragraph()
-            text = line
             
             # Handle bold **text**
-            parts = re.split(r'(\*\*.*?\*\*)', text)
-            for part in parts:
+            for part in _BOLD_RE.split(token[1]):
                 if part.startswith('**') and part.endswith('**'):
                     para.add_run(part[2:-2]).bold = True
                 else:
                     para.add_run(part)
-        
-        i += 1
     
-    doc.save(output_file)
+    _atomic_save(doc.save, output_file)
 
 
 # ============================================================================
@@ -190,91 +607,100 @@ def markdown_to_xlsx(md_content: str, output_file: str) -> None:
     ws = wb.active
     ws.title = "Data"
     
-    # Parse markdown to find tables
-    lines = md_content.split('\n')
-    table_num = 0
     current_row = 1
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
+    # Longest value seen per column, tracked as cells are written
+    col_widths: Dict[int, int] = {}
+    
+    # Header row styles are shared by every table
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
+    header_alignment = Alignment(horizontal="center")
+    
+    for token in _iter_md_tokens(md_content):
         # Add section headers as worksheet sections
-        if line.startswith('# ') or line.startswith('## '):
-            header_text = line.lstrip('#').strip()
+        if token[0] == 'h' and token[1] <= 2:
+            header_text = token[2].strip()
             cell = ws.cell(row=current_row, column=1, value=header_text)
             cell.font = Font(bold=True, size=14)
+            col_widths[1] = max(col_widths.get(1, 0), len(header_text))
             current_row += 2
         
-        # Parse tables
-        elif line.startswith('|'):
-            table_lines = [line]
-            j = i + 1
-            while j < len(lines) and lines[j].strip().startswith('|'):
-                table_lines.append(lines[j].strip())
-                j += 1
-            
-            # Parse table
-            rows = []
-            for tline in table_lines:
-                if '---' in tline:  # Skip separator
-                    continue
-                cells = [cell.strip() for cell in tline.split('|')[1:-1]]
-                rows.append(cells)
-            
-            if rows:
-                for row_data in rows:
-                    for col_idx, cell_data in enumerate(row_data, start=1):
-                        cell = ws.cell(row=current_row, column=col_idx, value=cell_data)
-                        
-                        # Style header row
-                        if current_row == 1 or rows.index(row_data) == 0:
-                            cell.font = Font(bold=True, color="FFFFFF")
-                            cell.fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-                            cell.alignment = Alignment(horizontal="center")
+        # Write tables
+        elif token[0] == 'table':
+            rows = token[1]
+            for row_idx, row_data in enumerate(rows):
+                for col_idx, cell_data in enumerate(row_data, start=1):
+                    cell = ws.cell(row=current_row, column=col_idx, value=cell_data)
+                    col_widths[col_idx] = max(col_widths.get(col_idx, 0), len(cell_data))
                     
-                    current_row += 1
+                    # Style header row
+                    if row_idx == 0:
+                        cell.font = header_font
+                        cell.fill = header_fill
+                        cell.alignment = header_alignment
                 
-                current_row += 2  # Add spacing between tables
+                current_row += 1
+            
+            current_row += 2  # Add spacing between tables
     
     # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
+    for col_idx, max_length in col_widths.items():
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_length + 2, 50)
     
-    wb.save(output_file)
+    _atomic_save(wb.save, output_file)
 
 
 # ============================================================================
 # PPTX Functions
 # ============================================================================
 
-def extract_markdown_sections(md_content: str) -> List[Tuple[str, str]]:
-    """Extract sections from markdown based on ## headers."""
+def extract_markdown_sections_indexed(md_content: str) -> List[Tuple[str, str, str]]:
+    """Extract sections from markdown based on ## headers.
+    
+    The normalized title is computed as each header is found, so callers
+    matching against slide/page titles need no second normalization pass.
+    
+    Returns:
+        List of (normalized_title, title, content) tuples
+    """
     sections = []
-    lines = md_content.split('\n')
     current_header = None
+    current_normalized = None
     current_content = []
     
-    for line in lines:
-        if line.strip().startswith('## '):
+    # Iterate lazily rather than materializing every line up front
+    for line in io.StringIO(md_content):
+        line = line.rstrip('\n')
+        header = _HDR_RE.match(line)
+        if header:
             if current_header is not None:
-                sections.append((current_header, '\n'.join(current_content)))
-            current_header = line.strip()[3:].strip()
+                sections.append((current_normalized, current_header, '\n'.join(current_content)))
+            current_header = header.group(1)
+            current_normalized = normalize_text(current_header)
             current_content = []
         else:
             current_content.append(line)
     
     if current_header is not None:
-        sections.append((current_header, '\n'.join(current_content)))
+        sections.append((current_normalized, current_header, '\n'.join(current_content)))
     
     return sections
 
 
+def extract_markdown_sections(md_content: str) -> List[Tuple[str, str]]:
+    """Extract sections from markdown based on ## headers."""
+    return [(title, content) for _, title, content in extract_markdown_sections_indexed(md_content)]
+
+
+def _body_placeholder(slide):
+    """Return the slide's body placeholder (idx 1), or None if its layout has none."""
+    try:
+        return slide.placeholders[1]
+    except KeyError:
+        return None
+
+
 def markdown_to_pptx(md_content: str, output_file: str) -> None:
     """Convert markdown sections to PowerPoint presentation."""
     prs = Presentation()
@@ -284,12 +710,13 @@ def markdown_to_pptx(md_content: str, output_file: str) -> None:
     sections = extract_markdown_sections(md_content)
     
     if not sections:
-        print("Warning: No ## headers found in markdown. Creating single slide.")
+        _log("Warning: No ## headers found in markdown. Creating single slide.")
         sections = [("Untitled", md_content)]
     
+    slide_layout = prs.slide_layouts[1]  # Title and Content
+    
     for title, content in sections:
         # Add slide with title and content layout
-        slide_layout = prs.slide_layouts[1]  # Title and Content
         slide = prs.slides.add_slide(slide_layout)
         
         # Set title
@@ -297,63 +724,61 @@ def markdown_to_pptx(md_content: str, output_file: str) -> None:
         title_shape.text = title
         
         # Set content
-        if len(slide.shapes) > 1:
-            content_shape = slide.shapes[1]
-            if hasattr(content_shape, 'text_frame'):
-                tf = content_shape.text_frame
-                tf.text = content.strip()
+        body = _body_placeholder(slide)
+        if body is not None:
+            body.text_frame.text = content.strip()
     
-    prs.save(output_file)
+    _atomic_save(prs.save, output_file)
 
 
-def append_to_pptx(markdown_file: str, existing_pptx: str, output_file: str) -> None:
-    """Append markdown slides to existing presentation."""
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+def append_to_pptx(md_content: str, existing_pptx: str, output_file: str, prs=None) -> None:
+    """Append markdown slides to existing presentation.
     
+    If the caller has already loaded existing_pptx it can pass the Presentation
+    as prs so the file is not unzipped and parsed a second time.
+    """
     # Load existing presentation
-    prs = Presentation(existing_pptx)
+    if prs is None:
+        prs = Presentation(existing_pptx)
     original_count = len(prs.slides)
     
     # Add new slides
     sections = extract_markdown_sections(md_content)
+    slide_layout = prs.slide_layouts[1]
     for title, content in sections:
-        slide_layout = prs.slide_layouts[1]
         slide = prs.slides.add_slide(slide_layout)
         slide.shapes.title.text = title
         
-        if len(slide.shapes) > 1 and hasattr(slide.shapes[1], 'text_frame'):
-            slide.shapes[1].text_frame.text = content.strip()
+        body = _body_placeholder(slide)
+        if body is not None:
+            body.text_frame.text = content.strip()
     
-    prs.save(output_file)
-    print(f"Presentation created successfully: {output_file}")
-    print(f"  Original slides: {original_count}")
-    print(f"  Appended slides: {len(sections)}")
-    print(f"  Total slides: {len(prs.slides)}")
+    _atomic_save(prs.save, output_file)
+    _log(f"Presentation created successfully: {output_file}")
+    _log(f"  Original slides: {original_count}")
+    _log(f"  Appended slides: {len(sections)}")
+    _log(f"  Total slides: {len(prs.slides)}")
 
 
 def normalize_text(text: str) -> str:
-    """Normalize text for comparison."""
-    return re.sub(r'\s+', ' ', text.lower().strip())
+    """Normalize text for comparison (case-folded, whitespace collapsed)."""
+    return _WS_RE.sub(' ', text.casefold().strip())
 
 
-def replace_pptx_slides(markdown_file: str, existing_pptx: str, output_file: str) -> None:
+def replace_pptx_slides(md_content: str, existing_pptx: str, output_file: str) -> None:
     """Replace slides in presentation where titles match markdown headers."""
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
-    
-    sections = extract_markdown_sections(md_content)
+    sections = extract_markdown_sections_indexed(md_content)
     if not sections:
-        print("Warning: No ## headers found in markdown")
-        print("Using append mode instead...")
-        append_to_pptx(markdown_file, existing_pptx, output_file)
+        _log("Warning: No ## headers found in markdown")
+        _log("Using append mode instead...")
+        append_to_pptx(md_content, existing_pptx, output_file)
         return
     
     # Load existing presentation
     prs = Presentation(existing_pptx)
     
     # Build section map
-    section_map = {normalize_text(title): (title, content) for title, content in sections}
+    section_map = {normalized: (title, content) for normalized, title, content in sections}
     
     # Find matches and track replacements
     matches = []
@@ -366,14 +791,14 @@ def replace_pptx_slides(markdown_file: str, existing_pptx: str, output_file: str
                 matches.append((idx, slide_title, section_map[normalized]))
     
     if not matches:
-        print("Warning: No matching slide titles found")
-        print("Using append mode instead...")
-        append_to_pptx(markdown_file, existing_pptx, output_file)
+        _log("Warning: No matching slide titles found")
+        _log("Using append mode instead...")
+        append_to_pptx(md_content, existing_pptx, output_file, prs=prs)
         return
     
-    print(f"Found {len(matches)} matching slides to replace:")
+    _log(f"Found {len(matches)} matching slides to replace:")
     for idx, title, _ in matches:
-        print(f"  Slide {idx + 1}: {title}")
+        _log(f"  Slide {idx + 1}: {title}")
     
     # Replace matched slides
     for idx, old_title, (new_title, content) in matches:
@@ -383,137 +808,336 @@ def replace_pptx_slides(markdown_file: str, existing_pptx: str, output_file: str
         slide.shapes.title.text = new_title
         
         # Update content
-        if len(slide.shapes) > 1 and hasattr(slide.shapes[1], 'text_frame'):
-            tf = slide.shapes[1].text_frame
+        body = _body_placeholder(slide)
+        if body is not None:
+            tf = body.text_frame
             tf.clear()
             tf.text = content.strip()
     
-    prs.save(output_file)
-    print(f"\nPresentation created successfully: {output_file}")
-    print(f"  Total slides: {len(prs.slides)}")
-    print(f"  Slides replaced: {len(matches)}")
+    _atomic_save(prs.save, output_file)
+    _log(f"\nPresentation created successfully: {output_file}")
+    _log(f"  Total slides: {len(prs.slides)}")
+    _log(f"  Slides replaced: {len(matches)}")
 
 
 # ============================================================================
 # PDF append/replace (existing functions)
 # ============================================================================
 
-def create_pdf(markdown_file: str, output_file: str) -> None:
-    """Create a new PDF from markdown file."""
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+def create_pdf(md_content: str, output_file: str) -> None:
+    """Create a new PDF from markdown content."""
+    if _pdf_cache_dir is None:
+        _atomic_write(lambda f: markdown_to_pdf_stream(md_content, f), output_file)
+    else:
+        # Go through the render cache so an unchanged document is not converted again
+        pdf_bytes = markdown_to_pdf_bytes(md_content)
+        _atomic_write(lambda f: f.write(pdf_bytes), output_file)
+    
+    _log(f"PDF created successfully: {output_file}")
+
+
+def append_to_pdf(md_content: str, existing_pdf: str, output_file: str) -> None:
+    """Append markdown content as new pages to an existing PDF."""
+    new_pdf = markdown_to_pdf_buffer(md_content)
     
-    pdf_bytes = markdown_to_pdf_bytes(md_content)
+    # Clone the existing document wholesale instead of re-adding it page by page
+    writer = PdfWriter(clone_from=existing_pdf)
+    original_pages = len(writer.pages)
+    writer.append(new_pdf, import_outline=False)
+    total_pages = len(writer.pages)
     
-    with open(output_file, 'wb') as f:
-        f.write(pdf_bytes)
+    _atomic_write(writer.write, output_file)
     
-    print(f"PDF created successfully: {output_file}")
+    _log(f"PDF created successfully: {output_file}")
+    _log(f"  Original pages: {original_pages}")
+    _log(f"  Appended pages: {total_pages - original_pages}")
+    _log(f"  Total pages: {total_pages}")
 
 
-def append_to_pdf(markdown_file: str, existing_pdf: str, output_file: str) -> None:
-    """Append markdown content as new pages to an existing PDF."""
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+def _iter_page_titles(reader: 'PdfReader', start: int = 0,
+                      stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+    """Yield (page_number, title) for pages start..stop of an open PDF, extracting lazily.
     
-    new_pdf_bytes = markdown_to_pdf_bytes(md_content)
+    The title is the first non-empty line of the page's text; pages without
+    text are skipped.
+    """
+    if stop is None:
+        stop = len(reader.pages)
+    for i in range(start, stop):
+        text = reader.pages[i].extract_text()
+        if text:
+            stripped = (line.strip() for line in text.splitlines())
+            title = next((line for line in stripped if line), None)
+            if title:
+                yield (i, title)
+
+
+def extract_page_titles(pdf_path: str) -> List[Tuple[int, str]]:
+    """Extract title from each PDF page."""
+    return list(_iter_page_titles(PdfReader(pdf_path)))
+
+
+# Marker leading each section in a combined render. WeasyPrint turns the id into a
+# named destination; xhtml2pdf ignores ids but writes an outline entry for the
+# -pdf-outline paragraph. Its text is a lone no-break space, so the entry has a
+# blank title (unlike heading entries) and page title extraction skips the line.
+_SECTION_ANCHOR = 'md2pdf-section-{}'
+_SECTION_MARKER = ('<div id="{anchor}" style="{page_break}-pdf-outline: true; '
+                   '-pdf-outline-level: 0; font-size: 1px">&nbsp;</div>')
+
+
+def _valid_start_pages(starts: List[int], count: int) -> Optional[List[int]]:
+    """Return starts if they can be section start pages, otherwise None."""
+    # Every section starts on a fresh page, so the start pages must strictly increase
+    if len(starts) != count or starts[0] != 0 or any(b <= a for a, b in zip(starts, starts[1:])):
+        return None
+    return starts
+
+
+def _anchor_start_pages(reader: 'PdfReader', count: int) -> Optional[List[int]]:
+    """Find the page each section anchor landed on, or None if they cannot all be resolved."""
+    try:
+        destinations = reader.named_destinations
+    except Exception:
+        return None
     
-    reader_existing = PdfReader(existing_pdf)
-    reader_new = PdfReader(io.BytesIO(new_pdf_bytes))
+    starts = []
+    for i in range(count):
+        name = _SECTION_ANCHOR.format(i)
+        # /Dests dictionaries key by PDF name (leading slash), /Names trees by string
+        dest = destinations.get(name)
+        if dest is None:
+            dest = destinations.get('/' + name)
+        if dest is None:
+            return None
+        starts.append(reader.get_destination_page_number(dest))
     
-    writer = PdfWriter()
+    return _valid_start_pages(starts, count)
+
+
+def _outline_start_pages(reader: 'PdfReader', count: int) -> Optional[List[int]]:
+    """Find section starts from the blank-titled outline entries of the markers, or None."""
+    try:
+        outline = reader.outline
+    except Exception:
+        return None
     
-    for page in reader_existing.pages:
-        writer.add_page(page)
+    starts = []
+    # Nested lists hold the children of the entry before them; walk in document order
+    pending = [iter(outline)]
+    while pending:
+        item = next(pending[-1], None)
+        if item is None:
+            pending.pop()
+        elif isinstance(item, list):
+            pending.append(iter(item))
+        elif not (item.title or '').strip():
+            starts.append(reader.get_destination_page_number(item))
     
-    for page in reader_new.pages:
-        writer.add_page(page)
+    return _valid_start_pages(starts, count)
+
+
+def _render_combined(contents: List[str]) -> Optional[List[Tuple['PdfReader', Tuple[int, int]]]]:
+    """Render all sections in one pass and split the result at the section markers.
+    
+    Returns:
+        List of (reader, (start_page, end_page)) tuples, or None if the render
+        could not be split
+    """
+    parts = []
+    for i, content in enumerate(contents):
+        marker = _SECTION_MARKER.format(anchor=_SECTION_ANCHOR.format(i),
+                                        page_break='page-break-before: always; ' if i else '')
+        parts.append(f'{marker}\n\n{content}')
+    combined = '\n\n'.join(parts)
+    
+    pdf_bytes = _pdf_cache_get(combined)
+    if pdf_bytes is not None:
+        buffer = io.BytesIO(pdf_bytes)
+    else:
+        buffer = io.BytesIO()
+        markdown_to_pdf_stream(combined, buffer)
+        buffer.seek(0)
+    
+    reader = PdfReader(buffer)
+    if _pdf_backend == 'weasyprint':
+        starts = _anchor_start_pages(reader, len(contents))
+    else:
+        starts = _outline_start_pages(reader, len(contents))
+    if starts is None:
+        _log("Warning: Could not split the combined render at its section markers, "
+             "rendering sections separately")
+        return None
     
-    with open(output_file, 'wb') as f:
-        writer.write(f)
+    # Only a render that could be split is worth keeping in the cache
+    if pdf_bytes is None:
+        with buffer.getbuffer() as view:
+            _pdf_cache_put(combined, view)
     
-    print(f"PDF created successfully: {output_file}")
-    print(f"  Original pages: {len(reader_existing.pages)}")
-    print(f"  Appended pages: {len(reader_new.pages)}")
-    print(f"  Total pages: {len(reader_existing.pages) + len(reader_new.pages)}")
+    ends = starts[1:] + [len(reader.pages)]
+    return [(reader, (start, end)) for start, end in zip(starts, ends)]
 
 
-def extract_page_titles(pdf_path: str) -> List[Tuple[int, str]]:
-    """Extract title from each PDF page."""
-    if pdfplumber is None:
-        return []
+def _init_render_worker(cache_dir: Optional[str], backend: str, md_backend: str) -> None:
+    """Carry the CLI render settings into a worker process (spawned workers start fresh)."""
+    global _pdf_cache_dir, _pdf_backend, _md_backend
+    _pdf_cache_dir = cache_dir
+    _pdf_backend = backend
+    _md_backend = md_backend
+
+
+# Uncached markdown needed before separate section renders are worth starting
+# worker processes for; below this, process startup costs more than it saves
+PARALLEL_RENDER_MIN_CHARS = 64 * 1024
+
+
+def _render_sections(contents: List[str]) -> List[Tuple['PdfReader', Tuple[int, int]]]:
+    """Render markdown sections to PDF, each starting on its own page.
+    
+    All sections are converted in one pass, each led by a page break and a marker
+    that gives the section's first page (a named destination with WeasyPrint, an
+    outline entry with xhtml2pdf). If the markers cannot be resolved, the sections
+    are rendered separately, using parallel worker processes when the uncached
+    sections add up to at least PARALLEL_RENDER_MIN_CHARS of markdown.
     
-    page_titles = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for i, page in enumerate(pdf.pages):
-            text = page.extract_text()
-            if text:
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                if lines:
-                    page_titles.append((i, lines[0]))
+    Returns:
+        List of (reader, (start_page, end_page)) tuples, in the order of contents
+    """
+    if len(contents) > 1:
+        split = _render_combined(contents)
+        if split is not None:
+            return split
     
-    return page_titles
+    pdfs = [_pdf_cache_get(content) for content in contents]
+    misses = [i for i, pdf_bytes in enumerate(pdfs) if pdf_bytes is None]
+    # Sections are independent and rendering is CPU-bound, so spread them over the cores;
+    # with a single core a pool would only add process startup
+    workers = min(len(misses), os.cpu_count() or 1)
+    if workers > 1 and sum(len(contents[i]) for i in misses) >= PARALLEL_RENDER_MIN_CHARS:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_render_worker,
+                initargs=(_pdf_cache_dir, _pdf_backend, _md_backend)) as executor:
+            for i, pdf_bytes in zip(misses, executor.map(markdown_to_pdf_bytes,
+                                                         [contents[i] for i in misses])):
+                pdfs[i] = pdf_bytes
+    
+    buffers = [markdown_to_pdf_buffer(content) if pdf_bytes is None else io.BytesIO(pdf_bytes)
+               for content, pdf_bytes in zip(contents, pdfs)]
+    readers = [PdfReader(buffer) for buffer in buffers]
+    return [(reader, (0, len(reader.pages))) for reader in readers]
+
 
+# With --fast, replace mode gives up if none of this many leading pages match
+FAST_SCAN_PAGES = 3
 
-def replace_pdf_pages(markdown_file: str, existing_pdf: str, output_file: str) -> None:
-    """Replace PDF pages where markdown headers match page titles."""
-    with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+
+def replace_pdf_pages(md_content: str, existing_pdf: str, output_file: str,
+                      fast: bool = False) -> None:
+    """Replace PDF pages where markdown headers match page titles.
     
-    sections = extract_markdown_sections(md_content)
+    With fast=True, title extraction stops (and append mode is used) when the
+    first FAST_SCAN_PAGES pages produce no match, instead of scanning the whole PDF.
+    """
+    sections = extract_markdown_sections_indexed(md_content)
     if not sections:
-        print("Warning: No ## headers found in markdown file")
-        print("Using append mode instead...")
-        append_to_pdf(markdown_file, existing_pdf, output_file)
+        _log("Warning: No ## headers found in markdown file")
+        _log("Using append mode instead...")
+        append_to_pdf(md_content, existing_pdf, output_file)
         return
     
-    page_titles = extract_page_titles(existing_pdf)
-    section_map = {normalize_text(header): content for header, content in sections}
+    # Parse the existing PDF once; the same reader supplies titles and pages
+    reader_existing = PdfReader(existing_pdf)
+    section_map = {normalized: content for normalized, _, content in sections}
+    
+    total_pages = len(reader_existing.pages)
     
+    # With --fast the opening pages are scanned first, and the rest only if one matched
+    scan_stop = min(FAST_SCAN_PAGES, total_pages) if fast else total_pages
     matches = []
-    for page_num, page_title in page_titles:
-        normalized = normalize_text(page_title)
-        if normalized in section_map:
-            matches.append((page_num, page_title, section_map[normalized]))
+    for start, stop in ((0, scan_stop), (scan_stop, total_pages)):
+        if start >= stop:
+            break
+        if start and not matches:
+            _log(f"No matches in the first {FAST_SCAN_PAGES} pages, skipping the rest (--fast)")
+            break
+        for page_num, page_title in _iter_page_titles(reader_existing, start, stop):
+            normalized = normalize_text(page_title)
+            if normalized in section_map:
+                matches.append((page_num, page_title, normalized))
     
     if not matches:
-        print("Warning: No matching headers found between PDF and markdown")
-        print("Using append mode instead...")
-        append_to_pdf(markdown_file, existing_pdf, output_file)
+        _log("Warning: No matching headers found between PDF and markdown")
+        _log("Using append mode instead...")
+        append_to_pdf(md_content, existing_pdf, output_file)
         return
     
-    print(f"Found {len(matches)} matching pages to replace:")
+    _log(f"Found {len(matches)} matching pages to replace:")
     for page_num, title, _ in matches:
-        print(f"  Page {page_num + 1}: {title}")
+        _log(f"  Page {page_num + 1}: {title}")
+    
+    # Render each matched section once, even if its title appears on several pages
+    keys = list(dict.fromkeys(key for _, _, key in matches))
+    rendered = dict(zip(keys, _render_sections([section_map[key] for key in keys])))
     
-    reader_existing = PdfReader(existing_pdf)
     writer = PdfWriter()
     
-    for page_num in range(len(reader_existing.pages)):
-        match = next((m for m in matches if m[0] == page_num), None)
-        
-        if match:
-            _, title, section_content = match
-            section_pdf_bytes = markdown_to_pdf_bytes(section_content)
-            section_reader = PdfReader(io.BytesIO(section_pdf_bytes))
-            
-            for section_page in section_reader.pages:
-                writer.add_page(section_page)
-        else:
-            writer.add_page(reader_existing.pages[page_num])
+    # matches is in page order, so walk it and copy the unmatched gaps between
+    # consecutive matches as whole runs; no per-page loop or lookup is needed
+    next_page = 0
+    for page_num, _, key in matches:
+        if page_num > next_page:
+            writer.append(reader_existing, pages=(next_page, page_num), import_outline=False)
+        section_reader, section_pages = rendered[key]
+        writer.append(section_reader, pages=section_pages, import_outline=False)
+        next_page = page_num + 1
+    
+    if next_page < total_pages:
+        writer.append(reader_existing, pages=(next_page, total_pages), import_outline=False)
     
-    with open(output_file, 'wb') as f:
-        writer.write(f)
+    _atomic_write(writer.write, output_file)
     
-    print(f"\nPDF created successfully: {output_file}")
-    print(f"  Original pages: {len(reader_existing.pages)}")
-    print(f"  Pages replaced: {len(matches)}")
+    _log(f"\nPDF created successfully: {output_file}")
+    _log(f"  Original pages: {total_pages}")
+    _log(f"  Pages replaced: {len(matches)}")
 
 
 # ============================================================================
 # Main CLI
 # ============================================================================
 
+SUPPORTED_FORMATS = ['pdf', 'docx', 'xlsx', 'pptx']
+
+
+def convert_markdown(md_content: str, fmt: str, output_file: str,
+                     append: Optional[str] = None, replace: Optional[str] = None,
+                     fast: bool = False) -> None:
+    """Convert markdown content to a single output format."""
+    if fmt == 'pdf':
+        if append:
+            append_to_pdf(md_content, append, output_file)
+        elif replace:
+            replace_pdf_pages(md_content, replace, output_file, fast=fast)
+        else:
+            create_pdf(md_content, output_file)
+    
+    elif fmt == 'docx':
+        markdown_to_docx(md_content, output_file)
+        _log(f"Word document created successfully: {output_file}")
+    
+    elif fmt == 'xlsx':
+        markdown_to_xlsx(md_content, output_file)
+        _log(f"Excel spreadsheet created successfully: {output_file}")
+    
+    elif fmt == 'pptx':
+        if append:
+            append_to_pptx(md_content, append, output_file)
+        elif replace:
+            replace_pptx_slides(md_content, replace, output_file)
+        else:
+            markdown_to_pptx(md_content, output_file)
+            _log(f"PowerPoint presentation created successfully: {output_file}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Convert Markdown to PDF, DOCX, XLSX, or PPTX formats',
@@ -532,6 +1156,9 @@ Examples:
   # Create PowerPoint presentation
   python convert.py input.md --format pptx -o output.pptx
   
+  # Create several formats at once (input.pdf, input.docx, ...)
+  python convert.py input.md --format pdf,docx,xlsx,pptx
+  
   # Append to existing presentation
   python convert.py new_slides.md --format pptx --append existing.pptx -o updated.pptx
   
@@ -542,12 +1169,25 @@ Examples:
     
     parser.add_argument('markdown_file', help='Input markdown file')
     parser.add_argument('-o', '--output', help='Output file (default: input name with format extension)')
-    parser.add_argument('--format', choices=['pdf', 'docx', 'xlsx', 'pptx'], default='pdf',
-                       help='Output format (default: pdf)')
+    parser.add_argument('--format', default='pdf',
+                       help='Output format, or a comma-separated list of formats: '
+                            'pdf, docx, xlsx, pptx (default: pdf)')
     parser.add_argument('--append', metavar='FILE', 
                        help='Append to existing file (PDF or PPTX only)')
     parser.add_argument('--replace', metavar='FILE',
                        help='Replace matching content in existing file (PDF or PPTX only)')
+    parser.add_argument('--fast', action='store_true',
+                       help=f'PDF replace: fall back to append if none of the first '
+                            f'{FAST_SCAN_PAGES} pages match, without scanning the rest')
+    parser.add_argument('--backend', choices=['weasyprint', 'pisa'],
+                       help='HTML-to-PDF renderer (default: weasyprint if it can be loaded, '
+                            'otherwise pisa)')
+    parser.add_argument('--md-backend', choices=['markdown2', 'mistune'], default='markdown2',
+                       help='Markdown parser for PDF output (default: markdown2)')
+    parser.add_argument('--cache-dir', metavar='DIR', default='.md2pdf-cache',
+                       help='Directory for cached PDF renders (default: .md2pdf-cache)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Always render PDFs from scratch and do not write the render cache')
     
     args = parser.parse_args()
     
@@ -556,83 +1196,102 @@ Examples:
         print(f"Error: Markdown file not found: {args.markdown_file}")
         sys.exit(1)
     
+    formats = []
+    for fmt in args.format.split(','):
+        fmt = fmt.strip().lower()
+        if fmt not in SUPPORTED_FORMATS:
+            print(f"Error: Unsupported format: {fmt} (choose from {', '.join(SUPPORTED_FORMATS)})")
+            sys.exit(1)
+        if fmt not in formats:
+            formats.append(fmt)
+    
     # Check format availability
-    if args.format == 'pdf' and not PDF_AVAILABLE:
-        print("Error: PDF support not available. Install: pip install xhtml2pdf pypdf pdfplumber")
-        sys.exit(1)
-    elif args.format == 'docx' and not DOCX_AVAILABLE:
-        print("Error: DOCX support not available. Install: pip install python-docx")
-        sys.exit(1)
-    elif args.format == 'xlsx' and not XLSX_AVAILABLE:
-        print("Error: XLSX support not available. Install: pip install openpyxl")
-        sys.exit(1)
-    elif args.format == 'pptx' and not PPTX_AVAILABLE:
-        print("Error: PPTX support not available. Install: pip install python-pptx")
-        sys.exit(1)
+    for fmt in formats:
+        if fmt == 'pdf' and not PDF_AVAILABLE:
+            print("Error: PDF support not available. Install: pip install xhtml2pdf pypdf")
+            sys.exit(1)
+        elif fmt == 'docx' and not DOCX_AVAILABLE:
+            print("Error: DOCX support not available. Install: pip install python-docx")
+            sys.exit(1)
+        elif fmt == 'xlsx' and not XLSX_AVAILABLE:
+            print("Error: XLSX support not available. Install: pip install openpyxl")
+            sys.exit(1)
+        elif fmt == 'pptx' and not PPTX_AVAILABLE:
+            print("Error: PPTX support not available. Install: pip install python-pptx")
+            sys.exit(1)
     
     # Validate mode combinations
     if args.append and args.replace:
         print("Error: Cannot use both --append and --replace modes")
         sys.exit(1)
     
-    if (args.append or args.replace) and args.format not in ['pdf', 'pptx']:
-        print(f"Error: --append and --replace are only supported for PDF and PPTX formats")
+    if (args.append or args.replace) and (len(formats) > 1 or formats[0] not in ['pdf', 'pptx']):
+        print("Error: --append and --replace are only supported for a single PDF or PPTX format")
         sys.exit(1)
     
-    # Determine output file
+    # WeasyPrint is only loaded when a PDF is actually being made
+    backend = args.backend or 'pisa'
+    if 'pdf' in formats and args.backend != 'pisa':
+        weasyprint_loaded = _load_weasyprint() is not None
+        if args.backend == 'weasyprint' and not weasyprint_loaded:
+            print("Error: WeasyPrint backend not available. Install: pip install weasyprint "
+                  "(it also needs the pango libraries)")
+            sys.exit(1)
+        backend = 'weasyprint' if weasyprint_loaded else 'pisa'
+    
+    if 'pdf' in formats and args.md_backend == 'mistune' and not MISTUNE_AVAILABLE:
+        print("Error: mistune not available. Install: pip install mistune")
+        sys.exit(1)
+    
+    existing_file = args.append or args.replace
+    if existing_file and not os.path.exists(existing_file):
+        print(f"Error: File not found: {existing_file}")
+        sys.exit(1)
+    
+    if args.output and len(formats) > 1:
+        print("Error: -o/--output can only be used with a single --format")
+        sys.exit(1)
+    
+    # Determine output files
     if args.output:
-        output_file = args.output
+        output_files = [args.output]
     else:
         base = os.path.splitext(args.markdown_file)[0]
-        output_file = f"{base}.{args.format}"
+        output_files = [f"{base}.{fmt}" for fmt in formats]
+    
+    global _pdf_cache_dir, _pdf_backend, _md_backend
+    _pdf_cache_dir = None if args.no_cache else args.cache_dir
+    _pdf_backend = backend
+    _md_backend = args.md_backend
     
-    # Execute conversion
+    # Execute conversion, buffering status output into a single write at the end
+    global _log_buffer
+    _log_buffer = io.StringIO()
     try:
-        with open(args.markdown_file, 'r', encoding='utf-8') as f:
-            md_content = f.read()
+        md_content = _read_markdown(args.markdown_file)
         
-        if args.format == 'pdf':
-            if args.append:
-                if not os.path.exists(args.append):
-                    print(f"Error: File not found: {args.append}")
-                    sys.exit(1)
-                append_to_pdf(args.markdown_file, args.append, output_file)
-            elif args.replace:
-                if not os.path.exists(args.replace):
-                    print(f"Error: File not found: {args.replace}")
-                    sys.exit(1)
-                replace_pdf_pages(args.markdown_file, args.replace, output_file)
-            else:
-                create_pdf(args.markdown_file, output_file)
-        
-        elif args.format == 'docx':
-            markdown_to_docx(md_content, output_file)
-            print(f"Word document created successfully: {output_file}")
-        
-        elif args.format == 'xlsx':
-            markdown_to_xlsx(md_content, output_file)
-            print(f"Excel spreadsheet created successfully: {output_file}")
+        if len(formats) == 1:
+            convert_markdown(md_content, formats[0], output_files[0], args.append, args.replace,
+                             fast=args.fast)
+        else:
+            # Each format writes its own file, so the conversions can run side by side
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(formats)) as executor:
+                futures = [executor.submit(convert_markdown, md_content, fmt, output_file)
+                           for fmt, output_file in zip(formats, output_files)]
+                for future in futures:
+                    future.result()
         
-        elif args.format == 'pptx':
-            if args.append:
-                if not os.path.exists(args.append):
-                    print(f"Error: File not found: {args.append}")
-                    sys.exit(1)
-                append_to_pptx(args.markdown_file, args.append, output_file)
-            elif args.replace:
-                if not os.path.exists(args.replace):
-                    print(f"Error: File not found: {args.replace}")
-                    sys.exit(1)
-                replace_pptx_slides(args.markdown_file, args.replace, output_file)
-            else:
-                markdown_to_pptx(md_content, output_file)
-                print(f"PowerPoint presentation created successfully: {output_file}")
+        _pdf_cache_prune()
     
     except Exception as e:
-        print(f"Error: {e}")
+        _log(f"Error: {e}")
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        sys.stdout.write(_log_buffer.getvalue())
+        sys.stdout.flush()
+        _log_buffer = None
 
 
 if __name__ == '__main__':
@@ -4,7 +4,7 @@ import os
 import re
 import sys
 import tempfile
-from typing import List, Optional, Tuple
+from typing import List, Optional, TextIO, Tuple, Union
 
 import markdown2
 from xhtml2pdf import pisa
@@ -19,6 +19,9 @@ try:
 except ImportError:
     pdfplumber = None  # Optional dependency for replace mode
 
+# Whitespace collapsing pattern for normalize_text
+_WS_RE = re.compile(r'\s+')
+
 
 def get_html_template(content: str) -> str:
     """Generate HTML template with styling for PDF conversion."""
@@ -102,16 +105,10 @@ def append_to_pdf(markdown_file: str, existing_pdf: str, output_file: str) -> No
     reader_existing = PdfReader(existing_pdf)
     reader_new = PdfReader(io.BytesIO(new_pdf_bytes))
     
-    # Create writer and append all pages
+    # Create writer and append both documents in bulk
     writer = PdfWriter()
-    
-    # Add all pages from existing PDF
-    for page in reader_existing.pages:
-        writer.add_page(page)
-    
-    # Add all pages from new PDF
-    for page in reader_new.pages:
-        writer.add_page(page)
+    writer.append(reader_existing, import_outline=False)
+    writer.append(reader_new, import_outline=False)
     
     # Write output
     with open(output_file, 'wb') as f:
@@ -123,18 +120,21 @@ def append_to_pdf(markdown_file: str, existing_pdf: str, output_file: str) -> No
     print(f"  Total pages: {len(reader_existing.pages) + len(reader_new.pages)}")
 
 
-def extract_markdown_sections(md_content: str) -> List[Tuple[str, str]]:
+def extract_markdown_sections(md_source: Union[str, TextIO]) -> List[Tuple[str, str]]:
     """Extract sections from markdown based on ## headers.
     
+    Accepts markdown text or an open text file; lines are read lazily either way.
+    
     Returns:
         List of (header_text, section_content) tuples
     """
     sections = []
-    lines = md_content.split('\n')
+    lines = io.StringIO(md_source) if isinstance(md_source, str) else md_source
     current_header = None
     current_content = []
     
     for line in lines:
+        line = line.rstrip('\n')
         # Check for ## header (level 2)
         if line.strip().startswith('## '):
             # Save previous section if exists
@@ -173,27 +173,30 @@ def extract_page_titles(pdf_path: str) -> List[Tuple[int, str]]:
             text = page.extract_text()
             if text:
                 # Try to extract first non-empty line as title
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                if lines:
-                    # Look for lines that might be headers (usually short, at the top)
-                    title = lines[0]
+                stripped = (line.strip() for line in text.splitlines())
+                title = next((line for line in stripped if line), None)
+                if title:
                     page_titles.append((i, title))
+            # Drop the page's cached layout objects so memory stays per-page
+            if hasattr(page, 'close'):
+                page.close()
+            elif hasattr(page, 'flush_cache'):
+                page.flush_cache()
     
     return page_titles
 
 
 def normalize_text(text: str) -> str:
     """Normalize text for comparison (lowercase, remove extra whitespace)."""
-    return re.sub(r'\s+', ' ', text.lower().strip())
+    return _WS_RE.sub(' ', text.lower().strip())
 
 
 def replace_pdf_pages(markdown_file: str, existing_pdf: str, output_file: str) -> None:
     """Replace PDF pages where markdown headers match page titles."""
-    # Read markdown and extract sections
+    # Extract sections straight from the file without reading it into memory first
     with open(markdown_file, 'r', encoding='utf-8') as f:
-        md_content = f.read()
+        sections = extract_markdown_sections(f)
     
-    sections = extract_markdown_sections(md_content)
     if not sections:
         print("Warning: No ## headers found in markdown file")
         print("Using append mode instead...")